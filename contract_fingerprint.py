@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Impressão digital de contratos para evitar processar versões duplicadas
+Calcula o hash dos bytes e uma assinatura MinHash do texto das primeiras páginas,
+agrupa versões iguais ou quase iguais do mesmo código POP e escolhe a versão
+assinada (ou a mais recente) de cada grupo
+"""
+
+import hashlib
+import os
+import re
+import sys
+import unicodedata
+import zlib
+
+import PyPDF2
+from docx_stream_reader import iter_docx_blocks
+
+# Páginas/caracteres lidos para a assinatura (barato face à extração completa)
+SIGNATURE_PAGES = 2
+SIGNATURE_CHARS = 8000
+SHINGLE_SIZE = 5
+NUM_PERMUTATIONS = 64
+NEAR_DUPLICATE_THRESHOLD = 0.85
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_PERMUTATIONS = [
+    (int.from_bytes(hashlib.sha256(b'a%d' % i).digest()[:8], 'big') % _MERSENNE_PRIME | 1,
+     int.from_bytes(hashlib.sha256(b'b%d' % i).digest()[:8], 'big') % _MERSENNE_PRIME)
+    for i in range(NUM_PERMUTATIONS)
+]
+
+# Preferência por nome do ficheiro; "para assinatura" é a versão final ainda por assinar
+VERSION_MARKERS = [
+    (3, ('signed', 'assinado')),
+    (2, ('assinatura',)),
+    (1, ('final',)),
+]
+
+
+def file_sha256(filepath):
+    """Hash SHA-256 dos bytes do ficheiro"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def leading_text(filepath):
+    """Texto das primeiras páginas (PDF) ou dos primeiros blocos (DOCX)"""
+    parts = []
+    size = 0
+    try:
+        if filepath.lower().endswith('.pdf'):
+            with open(filepath, 'rb') as file:
+                reader = PyPDF2.PdfReader(file)
+                for page in reader.pages[:SIGNATURE_PAGES]:
+                    parts.append(page.extract_text() or '')
+        elif filepath.lower().endswith('.docx'):
+            for block in iter_docx_blocks(filepath):
+                parts.append(block)
+                size += len(block)
+                if size >= SIGNATURE_CHARS:
+                    break
+    except Exception as e:
+        print(f"Erro ao ler {filepath}: {e}")
+    return ' '.join(parts)[:SIGNATURE_CHARS]
+
+
+def normalize_text(text):
+    """Minúsculas, sem acentos e com espaços colapsados"""
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def minhash_signature(text):
+    """Assinatura MinHash dos shingles de caracteres do texto (None se não houver texto)"""
+    text = normalize_text(text)
+    if len(text) < SHINGLE_SIZE:
+        return None
+    hashes = {
+        zlib.crc32(text[i:i + SHINGLE_SIZE].encode('utf-8'))
+        for i in range(len(text) - SHINGLE_SIZE + 1)
+    }
+    return tuple(
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def estimate_similarity(signature_a, signature_b):
+    """Estimativa da semelhança de Jaccard entre duas assinaturas"""
+    if signature_a is None or signature_b is None:
+        return 0.0
+    equal = sum(1 for x, y in zip(signature_a, signature_b) if x == y)
+    return equal / len(signature_a)
+
+
+def version_preference(filename):
+    """Assinado > para assinatura > final > rascunho"""
+    filename_lower = filename.lower()
+    for rank, markers in VERSION_MARKERS:
+        if any(marker in filename_lower for marker in markers):
+            return rank
+    return 0
+
+
+def version_rank(entry):
+    """Ordem de preferência pelo nome do ficheiro, depois o mais recente"""
+    return (version_preference(os.path.basename(entry['path'])), os.path.getmtime(entry['path']))
+
+
+def group_versions(entries, threshold=NEAR_DUPLICATE_THRESHOLD):
+    """
+    Agrupa versões iguais ou quase iguais por código POP.
+
+    ``entries`` é uma lista de dicts com 'code' e 'path'. Duplicados exatos
+    são detetados só pelo hash; o texto apenas é lido para os restantes.
+    Devolve uma lista de grupos (listas de entries), cada um ordenado da versão
+    preferida para a menos preferida.
+    """
+    by_code = {}
+    for entry in entries:
+        by_code.setdefault(entry['code'], []).append(entry)
+
+    groups = []
+    for code_entries in by_code.values():
+        # Duplicados exatos
+        by_hash = {}
+        for entry in code_entries:
+            by_hash.setdefault(file_sha256(entry['path']), []).append(entry)
+        exact_groups = list(by_hash.values())
+
+        # Quase duplicados: compara um representante de cada grupo exato
+        if len(exact_groups) > 1:
+            signatures = [minhash_signature(leading_text(group[0]['path'])) for group in exact_groups]
+            merged = []
+            for group, signature in zip(exact_groups, signatures):
+                for target in merged:
+                    if estimate_similarity(signature, target['signature']) >= threshold:
+                        target['entries'].extend(group)
+                        break
+                else:
+                    merged.append({'signature': signature, 'entries': list(group)})
+            exact_groups = [target['entries'] for target in merged]
+
+        for group in exact_groups:
+            groups.append(sorted(group, key=version_rank, reverse=True))
+
+    return groups
+
+
+def select_versions(entries, threshold=NEAR_DUPLICATE_THRESHOLD):
+    """
+    Escolhe a versão preferida de cada grupo de duplicados.
+    Devolve (selecionados, ignorados); cada ignorado tem 'duplicate_of' com o path escolhido.
+    """
+    selected = []
+    skipped = []
+    for group in group_versions(entries, threshold):
+        selected.append(group[0])
+        for entry in group[1:]:
+            skipped.append(dict(entry, duplicate_of=group[0]['path']))
+    return selected, skipped
+
+
+def print_duplicates(skipped):
+    """Lista as versões duplicadas e a versão preferida de cada uma"""
+    for entry in skipped:
+        print(f"⏭️  {entry['code']}: {os.path.basename(entry['path'])} "
+              f"→ usa {os.path.basename(entry['duplicate_of'])}")
+
+
+def main():
+    from extract_contracts import CONTRACTS_DIR, extract_pop_code
+
+    contracts_dir = sys.argv[1] if len(sys.argv) > 1 else CONTRACTS_DIR
+    entries = []
+    for filename in sorted(os.listdir(contracts_dir)):
+        if not filename.lower().endswith(('.pdf', '.docx')):
+            continue
+        code = extract_pop_code(filename)
+        if code:
+            entries.append({'code': code, 'path': os.path.join(contracts_dir, filename)})
+
+    selected, skipped = select_versions(entries)
+    print_duplicates(skipped)
+    print(f"\n🧬 {len(selected)} versões únicas, {len(skipped)} versões duplicadas")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Índice de pesquisa full-text sobre o texto extraído dos contratos GAVINHO
+Guarda o texto por documento (código POP + ficheiro) e por página numa base SQLite
+FTS5, atualizada incrementalmente à medida que os contratos são processados
+
+Uso: python3 contract_text_index.py "honorários fase" [--limit 20]
+"""
+
+import os
+import re
+import sqlite3
+import sys
+import time
+
+INDEX_FILE = "/home/ubuntu/gavinho_project_manager/contracts_text_index.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contracts (
+    code TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    pages INTEGER NOT NULL,
+    indexed_at REAL NOT NULL,
+    PRIMARY KEY (code, filename)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS contract_pages USING fts5(
+    code UNINDEXED,
+    filename UNINDEXED,
+    page UNINDEXED,
+    text,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+def open_index(index_file=INDEX_FILE):
+    """Abre (ou cria) o índice"""
+    conn = sqlite3.connect(index_file)
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(contract_pages)")]
+    if columns and 'filename' not in columns:
+        # Índice antigo, indexado só por código: reconstruído a partir dos contratos
+        conn.executescript("DROP TABLE contract_pages; DROP TABLE contracts;")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def is_indexed(conn, code, filepath):
+    """Verifica se o documento já está indexado a partir da mesma versão do ficheiro"""
+    filename = os.path.basename(filepath)
+    row = conn.execute(
+        "SELECT mtime, size FROM contracts WHERE code = ? AND filename = ?", (code, filename)
+    ).fetchone()
+    if not row:
+        return False
+    stat = os.stat(filepath)
+    return row == (stat.st_mtime, stat.st_size)
+
+
+def index_contract(conn, code, filepath, pages):
+    """Substitui o texto indexado de um documento (código + ficheiro) pelas páginas dadas"""
+    filename = os.path.basename(filepath)
+    stat = os.stat(filepath)
+    with conn:
+        conn.execute(
+            "DELETE FROM contract_pages WHERE code = ? AND filename = ?", (code, filename)
+        )
+        conn.executemany(
+            "INSERT INTO contract_pages (code, filename, page, text) VALUES (?, ?, ?, ?)",
+            [(code, filename, number, text) for number, text in enumerate(pages, start=1) if text],
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO contracts (code, filename, mtime, size, pages, indexed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (code, filename, stat.st_mtime, stat.st_size, len(pages), time.time()),
+        )
+
+
+def remove_other_documents(conn, code, filenames):
+    """Remove do índice os documentos do código que não estão em filenames (versões substituídas)"""
+    placeholders = ', '.join('?' * len(filenames))
+    with conn:
+        for table in ('contract_pages', 'contracts'):
+            conn.execute(
+                f"DELETE FROM {table} WHERE code = ? AND filename NOT IN ({placeholders})",
+                (code, *filenames),
+            )
+
+
+def _quote_terms(query):
+    """Converte texto livre numa query FTS5 segura (todos os termos, entre aspas)"""
+    terms = re.findall(r'\w+', query)
+    return ' '.join(f'"{term}"' for term in terms)
+
+
+def search(conn, query, limit=20):
+    """
+    Pesquisa o índice. Aceita sintaxe FTS5 ("prazo NEAR(30 dias)", "honorários AND fase");
+    se a query não for válida, pesquisa todos os termos literalmente (sem termos, não há resultados).
+    Devolve lista de dicts com code, filename, page e snippet, ordenada por relevância.
+    """
+    sql = """
+        SELECT code, filename, page,
+               snippet(contract_pages, 3, '[', ']', '…', 16)
+        FROM contract_pages
+        WHERE contract_pages MATCH ?
+        ORDER BY rank
+        LIMIT ?
+    """
+    try:
+        rows = conn.execute(sql, (query, limit)).fetchall()
+    except sqlite3.OperationalError:
+        quoted = _quote_terms(query)
+        if not quoted:
+            return []
+        rows = conn.execute(sql, (quoted, limit)).fetchall()
+
+    return [
+        {'code': code, 'filename': filename, 'page': page, 'snippet': snippet}
+        for code, filename, page, snippet in rows
+    ]
+
+
+def main():
+    args = sys.argv[1:]
+    limit = 20
+    if '--limit' in args:
+        position = args.index('--limit')
+        limit = int(args[position + 1])
+        del args[position:position + 2]
+
+    if not args:
+        print(__doc__.strip().splitlines()[-1])
+        sys.exit(1)
+
+    query = ' '.join(args)
+    if not os.path.exists(INDEX_FILE):
+        print(f"❌ Índice não encontrado: {INDEX_FILE}")
+        print("   Execute primeiro extract_contract_details.py")
+        sys.exit(1)
+
+    conn = open_index()
+    start = time.perf_counter()
+    results = search(conn, query, limit)
+    elapsed = time.perf_counter() - start
+
+    contracts = {}
+    for result in results:
+        contracts.setdefault((result['code'], result['filename']), []).append(result)
+
+    for (code, filename), matches in contracts.items():
+        print(f"\n📄 {code} - {filename}")
+        for match in matches:
+            print(f"   p.{match['page']}: {match['snippet']}")
+
+    print(f"\n🔎 {len(contracts)} documentos, {len(results)} páginas em {elapsed * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
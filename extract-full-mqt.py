@@ -5,10 +5,13 @@ Processes all 26 pages and extracts ~200+ items with full structure
 """
 
 import json
+import os
 import re
 from pdf2image import convert_from_path
 import pytesseract
 from PIL import Image
+from mqt_translation_memory import TM_FILE, TranslationMemory
+from mqt_validator import DEFAULT_RULES, CompiledRuleSet, summarize
 
 def extract_mqt_from_pdf(pdf_path, start_page=1, end_page=26):
     """Extract MQT items from all pages of the PDF"""
@@ -113,6 +116,18 @@ def main():
     
     items = extract_mqt_from_pdf(pdf_path)
     
+    # Fill EN fields left empty by OCR from the translation memory of past MQTs
+    if os.path.exists(TM_FILE):
+        filled, suggested = TranslationMemory.load(TM_FILE).fill_items(items)
+        print(f"Translation memory filled {filled} EN fields ({suggested} suggestions to review)")
+    
+    # Catch bad OCR output (duplicate codes, zero quantities) before it reaches the database
+    validation = CompiledRuleSet(DEFAULT_RULES).validate(items)
+    print(f"Validation: {summarize(validation)}")
+    for severity, rules in validation.items():
+        for name, violations in rules.items():
+            print(f"  [{severity}] {name}: {', '.join(v['code'] for v in violations[:10])}")
+    
     # Save to JSON
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(items, f, ensure_ascii=False, indent=2)
@@ -6,30 +6,33 @@ Extrai: valores contratuais, prazos, fases, datas de assinatura, documentos anex
 
 import os
 import re
+import sys
 import json
 from pathlib import Path
 import PyPDF2
-from docx import Document
+from docx_stream_reader import read_docx_text
+import contract_text_index
+import contract_fingerprint
+from extract_contracts import extract_pop_code
 
-def extract_from_pdf(filepath):
-    """Extrai texto de PDF"""
+def extract_pages_from_pdf(filepath):
+    """Extrai texto de PDF, uma string por página"""
     try:
         with open(filepath, 'rb') as file:
             reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-            return text
+            return [page.extract_text() for page in reader.pages]
     except Exception as e:
         print(f"Erro ao ler PDF {filepath}: {e}")
-        return ""
+        return []
+
+def extract_from_pdf(filepath):
+    """Extrai texto de PDF"""
+    return "".join(page + "\n" for page in extract_pages_from_pdf(filepath))
 
 def extract_from_docx(filepath):
-    """Extrai texto de DOCX"""
+    """Extrai texto de DOCX (parágrafos e tabelas, lido em streaming)"""
     try:
-        doc = Document(filepath)
-        text = "\n".join([para.text for para in doc.paragraphs])
-        return text
+        return read_docx_text(filepath)
     except Exception as e:
         print(f"Erro ao ler DOCX {filepath}: {e}")
         return ""
@@ -181,15 +184,17 @@ def extract_contract_type(text):
     
     return ' + '.join(found_types) if found_types else 'Arquitetura e Especialidades'
 
-def process_contract(filepath, code):
+def process_contract(filepath, code, index=None):
     """Processa um contrato e extrai todas as informações"""
     print(f"\n📄 Processando: {code} - {os.path.basename(filepath)}")
     
-    # Extrai texto
+    # Extrai texto (por página, no caso de PDF)
     if filepath.endswith('.pdf'):
-        text = extract_from_pdf(filepath)
+        pages = extract_pages_from_pdf(filepath)
+        text = "".join(page + "\n" for page in pages)
     elif filepath.endswith('.docx'):
         text = extract_from_docx(filepath)
+        pages = [text]
     else:
         print(f"  ⚠️  Formato não suportado")
         return None
@@ -198,6 +203,11 @@ def process_contract(filepath, code):
         print(f"  ❌ Não foi possível extrair texto")
         return None
     
+    # Atualiza o índice full-text se esta versão do ficheiro ainda não foi indexada
+    if index is not None and not contract_text_index.is_indexed(index, code, filepath):
+        contract_text_index.index_contract(index, code, filepath, pages)
+        print(f"  🔎 Indexado: {len(pages)} páginas")
+    
     # Extrai informações
     contract_data = {
         'code': code,
@@ -248,23 +258,60 @@ def main():
         ('POP.055.2024', 'POP.055.2024-EDIFÍCIOAMADORA_ZUME_signed.pdf.pdf'),
     ]
     
+    # Agrupa versões duplicadas do mesmo contrato pelo conteúdo
+    entries = [
+        {'code': extract_pop_code(path.name), 'path': str(path)}
+        for path in upload_dir.iterdir()
+        if path.suffix.lower() in ('.pdf', '.docx') and extract_pop_code(path.name)
+    ]
+    selected, skipped = contract_fingerprint.select_versions(entries)
+    contract_fingerprint.print_duplicates(skipped)
+    
+    if '--all' in sys.argv[1:]:
+        # Todos os contratos da pasta: só a versão preferida de cada grupo é extraída
+        contracts = sorted((entry['code'], os.path.basename(entry['path'])) for entry in selected)
+        parses_saved = len(skipped)
+        redirected = 0
+    else:
+        # Mapeamento fixo: um ficheiro por código, redirecionado para a versão preferida
+        preferred = {entry['path']: os.path.basename(entry['duplicate_of']) for entry in skipped}
+        redirected = sum(1 for _, filename in contracts if str(upload_dir / filename) in preferred)
+        contracts = [
+            (code, preferred.get(str(upload_dir / filename), filename))
+            for code, filename in contracts
+        ]
+        parses_saved = 0
+    
     all_data = []
+    index = contract_text_index.open_index()
     
     for code, filename in contracts:
         filepath = upload_dir / filename
         if filepath.exists():
-            data = process_contract(str(filepath), code)
+            data = process_contract(str(filepath), code, index)
             if data:
                 all_data.append(data)
         else:
             print(f"⚠️  Arquivo não encontrado: {filename}")
     
+    # Um código pode ter vários documentos (--all); versões substituídas saem do índice
+    documents = {}
+    for code, filename in contracts:
+        documents.setdefault(code, []).append(filename)
+    for code, filenames in documents.items():
+        contract_text_index.remove_other_documents(index, code, filenames)
+    index.close()
+    
     # Salva resultados
     output_file = Path('/home/ubuntu/gavinho_project_manager/contracts_detailed.json')
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(all_data, f, ensure_ascii=False, indent=2)
     
     print(f"\n✅ Processados {len(all_data)} contratos")
+    if redirected:
+        print(f"🧬 {redirected} contratos redirecionados para a versão assinada/mais recente")
+    if parses_saved:
+        print(f"🧬 {parses_saved} extrações completas poupadas (versões duplicadas)")
     print(f"📁 Dados salvos em: {output_file}")
     
     # Estatísticas
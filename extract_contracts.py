@@ -5,6 +5,7 @@ Script para extrair dados estruturados de contratos PDF/DOCX
 import os
 import json
 import re
+import sys
 from pathlib import Path
 
 # Diretório com os contratos
@@ -41,7 +42,10 @@ def determine_status(filename):
         return 'draft'
 
 def main():
+    # --fingerprint: agrupa versões duplicadas pelo conteúdo (lê os ficheiros, requer PyPDF2)
+    fingerprint = '--fingerprint' in sys.argv[1:]
     contracts = []
+    entries = []
     
     # Listar todos os ficheiros no diretório
     for filename in os.listdir(CONTRACTS_DIR):
@@ -54,8 +58,24 @@ def main():
             print(f"⚠️  Não foi possível extrair código POP de: {filename}")
             continue
         
+        entries.append({
+            'code': pop_code,
+            'path': os.path.join(CONTRACTS_DIR, filename),
+            'status': determine_status(filename),
+        })
+    
+    # Opcional: agrupar versões duplicadas e ficar só com a assinada/mais recente
+    selected, skipped = entries, []
+    if fingerprint:
+        import contract_fingerprint
+        selected, skipped = contract_fingerprint.select_versions(entries)
+        contract_fingerprint.print_duplicates(skipped)
+    
+    for entry in selected:
+        filename = os.path.basename(entry['path'])
+        pop_code = entry['code']
         project_name = extract_project_name(filename)
-        status = determine_status(filename)
+        status = entry['status']
         
         # Extrair ano do código POP
         year_match = re.search(r'\.(\d{4})$', pop_code)
@@ -83,6 +103,8 @@ def main():
         json.dump(contracts, f, ensure_ascii=False, indent=2)
     
     print(f"\n✅ {len(contracts)} contratos extraídos para {OUTPUT_FILE}")
+    if fingerprint:
+        print(f"🧬 {len(skipped)} versões duplicadas omitidas")
     
     # Mostrar resumo
     print("\n📊 Resumo por status:")
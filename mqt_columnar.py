@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Columnar in-memory representation of extracted MQT items
+Quantities and prices live in NumPy arrays, repeated strings (category, unit, type,
+subtype, zone, descriptions) are dictionary-encoded into integer codes, and totals,
+per-category subtotals (mqtCategories.subtotal) and executed percentages are computed
+vectorized. Loads from and saves to the same JSON the extractors produce.
+
+Usage:
+  python3 mqt_columnar.py <mqt.json>          # print category subtotals
+  python3 mqt_columnar.py --benchmark [N]     # compare with the list-of-dicts path
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from mqt_items import parse_mqt, save_mqt
+
+# Dictionary-encoded text fields, in the order they appear in the items
+TEXT_FIELDS = [
+    'typePt', 'typeEn', 'subtypePt', 'subtypeEn', 'zonePt', 'zoneEn',
+    'descriptionPt', 'descriptionEn',
+]
+
+# Item keys held in columns; any other key (id, status, notes, ...) is kept per item as is
+MODELLED_FIELDS = {
+    'code', 'categoryCode', 'unit', 'quantity', 'unitPrice', 'totalPrice', 'quantityExecuted',
+    'order', *TEXT_FIELDS,
+}
+
+
+def _extras(item):
+    """Unmodelled keys of an item, or None when it has none"""
+    extras = {key: value for key, value in item.items() if key not in MODELLED_FIELDS}
+    return extras or None
+
+
+def _to_float(value):
+    """Parse a JSON/DB decimal value; missing values become NaN"""
+    if value is None or value == '':
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class StringColumn:
+    """Dictionary-encoded string column: unique values plus int32 codes"""
+
+    def __init__(self, values, codes):
+        self.values = values
+        self.codes = codes
+
+    @classmethod
+    def encode(cls, strings):
+        lookup = {}
+        values = []
+        codes = np.empty(len(strings), dtype=np.int32)
+        for i, text in enumerate(strings):
+            code = lookup.get(text)
+            if code is None:
+                code = lookup[text] = len(values)
+                values.append(text)
+            codes[i] = code
+        return cls(values, codes)
+
+    def __getitem__(self, index):
+        return self.values[self.codes[index]]
+
+    def __len__(self):
+        return len(self.codes)
+
+
+class MqtItemTable:
+    """Column store for a list of MQT items"""
+
+    def __init__(self, codes, categories, units, text, quantity, unit_price,
+                 quantity_executed, order, extras=None, metadata=None):
+        self.codes = codes                          # list of item codes (unique per item)
+        self.categories = categories                # StringColumn of categoryCode
+        self.units = units                          # StringColumn of unit
+        self.text = text                            # field name -> StringColumn
+        self.quantity = quantity                    # float64, NaN when missing
+        self.unit_price = unit_price                # float64, NaN when not priced
+        self.quantity_executed = quantity_executed  # float64, NaN when not reported
+        self.order = order                          # int32
+        self.extras = extras                        # per item dict of unmodelled keys, or None
+        self.metadata = metadata or {}              # construction, categories, ...
+
+    def __len__(self):
+        return len(self.codes)
+
+    @classmethod
+    def from_items(cls, items, metadata=None):
+        """Build the table from the list-of-dicts item format"""
+        count = len(items)
+        return cls(
+            codes=[item.get('code', '') for item in items],
+            categories=StringColumn.encode([str(item.get('categoryCode', '')) for item in items]),
+            units=StringColumn.encode([item.get('unit', '') for item in items]),
+            text={
+                field: StringColumn.encode([item.get(field) or '' for item in items])
+                for field in TEXT_FIELDS
+            },
+            quantity=np.fromiter((_to_float(item.get('quantity')) for item in items), np.float64, count),
+            unit_price=np.fromiter((_to_float(item.get('unitPrice')) for item in items), np.float64, count),
+            quantity_executed=np.fromiter(
+                (_to_float(item.get('quantityExecuted')) for item in items), np.float64, count
+            ),
+            order=np.fromiter(
+                (item.get('order') or i + 1 for i, item in enumerate(items)), np.int32, count
+            ),
+            extras=[_extras(item) for item in items],
+            metadata=metadata,
+        )
+
+    def to_items(self):
+        """Convert back to the list-of-dicts item format (missing quantity as None)"""
+        totals = self.totals()
+        extras = self.extras or [None] * len(self)
+        items = []
+        for i in range(len(self)):
+            item = {
+                'code': self.codes[i],
+                'categoryCode': self.categories[i],
+            }
+            for field in TEXT_FIELDS:
+                item[field] = self.text[field][i]
+            item['unit'] = self.units[i]
+            item['quantity'] = None if np.isnan(self.quantity[i]) else float(self.quantity[i])
+            item['order'] = int(self.order[i])
+            if not np.isnan(self.unit_price[i]):
+                item['unitPrice'] = float(self.unit_price[i])
+                item['totalPrice'] = round(float(totals[i]), 2)
+            if not np.isnan(self.quantity_executed[i]):
+                item['quantityExecuted'] = float(self.quantity_executed[i])
+            if extras[i]:
+                item.update(extras[i])
+            items.append(item)
+        return items
+
+    @classmethod
+    def load_json(cls, path):
+        """
+        Load an MQT JSON file in any of the repo's formats (mqt_items.parse_mqt); for dicts
+        the other top-level keys are kept as metadata. Raises ValueError if it has no items.
+        """
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        _, items, _ = parse_mqt(data, Path(path).stem)
+        if not items:
+            raise ValueError(f"No MQT items found in {path}")
+        if isinstance(data, list):
+            return cls.from_items(items)
+        metadata = {key: value for key, value in data.items() if key != 'items'}
+        return cls.from_items(items, metadata)
+
+    def save_json(self, path):
+        """Save in the same shape it was loaded from (nested snake_case files are rejected)"""
+        save_mqt(path, self.to_items(), self.metadata)
+
+    def totals(self):
+        """totalPrice per item (quantity * unitPrice, 0 when not priced)"""
+        return np.nan_to_num(self.quantity * self.unit_price)
+
+    def category_subtotals(self):
+        """mqtCategories.subtotal per categoryCode"""
+        sums = np.bincount(
+            self.categories.codes, weights=self.totals(), minlength=len(self.categories.values)
+        )
+        return {code: round(float(total), 2) for code, total in zip(self.categories.values, sums)}
+
+    def executed_percentages(self):
+        """Executed quantity as a percentage of planned quantity, per item (0 when planned is 0)"""
+        executed = np.nan_to_num(self.quantity_executed)
+        percentages = np.zeros(len(self), dtype=np.float64)
+        np.divide(executed * 100.0, self.quantity, out=percentages, where=self.quantity > 0)
+        return percentages
+
+    def category_executed_percentages(self):
+        """Executed value as a percentage of planned value, per categoryCode"""
+        prices = np.nan_to_num(self.unit_price)
+        minlength = len(self.categories.values)
+        planned = np.bincount(self.categories.codes, weights=np.nan_to_num(self.quantity) * prices,
+                              minlength=minlength)
+        executed = np.bincount(self.categories.codes,
+                               weights=np.nan_to_num(self.quantity_executed) * prices,
+                               minlength=minlength)
+        percentages = np.zeros(minlength, dtype=np.float64)
+        np.divide(executed * 100.0, planned, out=percentages, where=planned > 0)
+        return {code: round(float(value), 2) for code, value in zip(self.categories.values, percentages)}
+
+
+def dict_category_subtotals(items):
+    """Reference row-by-row implementation of the category subtotals"""
+    subtotals = {}
+    for item in items:
+        unit_price = _to_float(item.get('unitPrice'))
+        total = 0.0 if np.isnan(unit_price) else float(item['quantity']) * unit_price
+        code = str(item['categoryCode'])
+        subtotals[code] = subtotals.get(code, 0.0) + total
+    return {code: round(total, 2) for code, total in subtotals.items()}
+
+
+def synthetic_items(count, seed=0):
+    """Synthetic items with the shape of the extracted MQTs"""
+    rng = np.random.default_rng(seed)
+    descriptions = [
+        f"Fornecimento e execução de trabalhos tipo {i}, incluindo carga e transporte de entulho "
+        f"a vazadouro, conforme projecto;" for i in range(500)
+    ]
+    units = ['m2', 'm3', 'ml', 'un', 'vg']
+    quantities = rng.uniform(1, 500, count).round(2)
+    prices = rng.uniform(5, 800, count).round(2)
+    executed = (quantities * rng.uniform(0, 1.2, count)).round(2)
+    items = []
+    for i in range(count):
+        category = str(i % 25 + 1)
+        items.append({
+            'code': f"{category}.{i // 25 + 1}",
+            'categoryCode': category,
+            'typePt': f"Tipo {i % 40}",
+            'typeEn': f"Type {i % 40}",
+            'subtypePt': f"Subtipo {i % 120}",
+            'subtypeEn': f"Subtype {i % 120}",
+            'zonePt': 'Geral',
+            'zoneEn': 'General',
+            'descriptionPt': descriptions[i % 500],
+            'descriptionEn': '',
+            'unit': units[i % 5],
+            'quantity': float(quantities[i]),
+            'order': i + 1,
+            'unitPrice': str(prices[i]),
+            'quantityExecuted': str(executed[i]),
+        })
+    return items
+
+
+def _measure(build):
+    """Run build() and return (result, bytes allocated)"""
+    tracemalloc.start()
+    result = build()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, allocated
+
+
+def benchmark(count=100000):
+    """Compare memory per item and subtotal time with the list-of-dicts path"""
+    source = json.dumps(synthetic_items(count))
+
+    items, dict_bytes = _measure(lambda: json.loads(source))
+    table, table_bytes = _measure(lambda: MqtItemTable.from_items(json.loads(source)))
+
+    start = time.perf_counter()
+    dict_subtotals = dict_category_subtotals(items)
+    dict_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    table_subtotals = table.category_subtotals()
+    table_time = time.perf_counter() - start
+
+    assert all(abs(dict_subtotals[code] - table_subtotals[code]) < 0.011 for code in dict_subtotals)
+
+    print(f"Items: {count:,}")
+    print(f"Memory per item  dicts: {dict_bytes / count:7.0f} B   columnar: {table_bytes / count:7.0f} B")
+    print(f"Category subtotals dicts: {dict_time * 1000:7.1f} ms  columnar: {table_time * 1000:7.1f} ms")
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__.strip().split('Usage:')[1])
+        sys.exit(1)
+
+    if sys.argv[1] == '--benchmark':
+        benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 100000)
+        return
+
+    table = MqtItemTable.load_json(sys.argv[1])
+    executed = table.category_executed_percentages()
+    print(f"Items: {len(table)}  Total: €{table.totals().sum():,.2f}")
+    for code, subtotal in table.category_subtotals().items():
+        print(f"  {code:>4}  €{subtotal:>14,.2f}  executed {executed[code]:6.2f}%")
+
+
+if __name__ == "__main__":
+    main()
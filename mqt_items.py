@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Shared loader (and writer) for the MQT JSON formats found in the repo
+Normalizes the flat camelCase format (mqt-complete-data.json), bare item lists and the
+nested snake_case format (mqt-ga00466-extracted.json) to camelCase items that always
+carry a categoryCode, plus the list of categories with their PT/EN names.
+"""
+
+import json
+from pathlib import Path
+
+# snake_case field -> camelCase field, for items nested under categories[].items
+SNAKE_CASE_FIELDS = {
+    'category_code': 'categoryCode',
+    'type_pt': 'typePt',
+    'type_en': 'typeEn',
+    'subtype_pt': 'subtypePt',
+    'subtype_en': 'subtypeEn',
+    'zone': 'zonePt',
+    'zone_pt': 'zonePt',
+    'zone_en': 'zoneEn',
+    'description_pt': 'descriptionPt',
+    'description_en': 'descriptionEn',
+    'unit_price': 'unitPrice',
+    'total_price': 'totalPrice',
+    'quantity_executed': 'quantityExecuted',
+}
+
+
+def category_code(item, parent_code=None):
+    """categoryCode of an item: its own, the enclosing category's, or the prefix of its code"""
+    code = item.get('categoryCode') or parent_code or str(item.get('code', '')).split('.')[0]
+    return str(code).strip()
+
+
+def normalize_item(item, parent_code=None):
+    """camelCase copy of an item with categoryCode filled in"""
+    normalized = {SNAKE_CASE_FIELDS.get(key, key): value for key, value in item.items()}
+    normalized['categoryCode'] = category_code(normalized, parent_code)
+    return normalized
+
+
+def normalize_category(category):
+    return {
+        'code': str(category.get('code', '')).strip(),
+        'namePt': category.get('namePt') or category.get('name_pt') or '',
+        'nameEn': category.get('nameEn') or category.get('name_en') or '',
+        'order': category.get('order'),
+    }
+
+
+def is_nested(data):
+    """True for the nested snake_case format (items under categories[].items)"""
+    return isinstance(data, dict) and any('items' in c for c in data.get('categories', []))
+
+
+def parse_mqt(data, name=''):
+    """
+    Return (construction, items, categories) from loaded MQT JSON in any of the repo's
+    formats. Items are normalized with normalize_item(); categories is a list of
+    {code, namePt, nameEn, order} (empty for bare item lists).
+    """
+    if isinstance(data, list):
+        return name, [normalize_item(item) for item in data], []
+
+    items = [normalize_item(item) for item in data.get('items', [])]
+    categories = []
+    for category in data.get('categories', []):
+        categories.append(normalize_category(category))
+        items.extend(
+            normalize_item(item, categories[-1]['code']) for item in category.get('items', [])
+        )
+    construction = data.get('construction') or data.get('construction_code') or name
+    return construction, items, categories
+
+
+def load_mqt(path):
+    """parse_mqt() of an MQT JSON file; the construction defaults to the file name"""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    return parse_mqt(data, Path(path).stem)
+
+
+def save_mqt(path, items, metadata=None):
+    """
+    Write items back in the shape they were loaded from: a bare list, or a dict with the
+    other top-level keys (metadata) plus 'items'. The nested snake_case format is
+    read-only here, since writing 'items' next to categories[].items would duplicate them.
+    """
+    if is_nested(metadata):
+        raise ValueError("Nested snake_case MQT files cannot be written back; save to a new flat file")
+    data = dict(metadata, items=items) if metadata else items
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Cross-construction MQT item index for unit-price lookup
+Indexes priced items from past constructions by normalized (categoryCode, type, subtype, unit)
+plus description tokens, stores the index on disk as compact columnar gzip JSON, and
+prices a new MQT in batch with the nearest historical items and their price distribution.
+
+Usage:
+  python3 mqt_price_index.py build <priced-mqt.json> [<priced-mqt.json> ...]
+  python3 mqt_price_index.py price <new-mqt.json> [<output.json>]
+"""
+
+import gzip
+import heapq
+import json
+import re
+import statistics
+import sys
+import time
+import unicodedata
+from pathlib import Path
+
+from mqt_items import category_code, load_mqt
+
+INDEX_FILE = "/home/ubuntu/gavinho_project_manager/mqt-price-index.json.gz"
+
+NEIGHBORS = 10
+MAX_CANDIDATES = 200
+MAX_POSTING = 2000
+MIN_TOKEN_LENGTH = 3
+# Category part of the item keys; indexes saved with another key format must be rebuilt
+KEY_FORMAT = 'categoryCode'
+
+UNIT_ALIASES = {
+    'm²': 'm2', 'm³': 'm3', 'mt': 'm', 'ml': 'm', 'mts': 'm',
+    'und': 'un', 'unid': 'un', 'u': 'un', 'pç': 'un', 'pc': 'un',
+    'vg.': 'vg', 'cj.': 'cj',
+}
+
+STOPWORDS = {
+    'de', 'da', 'do', 'das', 'dos', 'e', 'em', 'com', 'para', 'por', 'a', 'o', 'as', 'os',
+    'incluindo', 'todos', 'todas', 'necessarios', 'necessarias', 'conforme', 'projeto',
+    'projecto', 'trabalhos', 'materiais', 'acordo', 'tudo',
+}
+
+
+def normalize_text(text):
+    """Lowercase, strip accents and collapse whitespace"""
+    text = unicodedata.normalize('NFKD', str(text or ''))
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def normalize_unit(unit):
+    unit = str(unit or '').strip().lower()
+    return UNIT_ALIASES.get(unit, unit)
+
+
+def description_tokens(text):
+    """Set of meaningful description tokens"""
+    return {
+        token for token in re.findall(r'[a-z0-9]+', normalize_text(text))
+        if len(token) >= MIN_TOKEN_LENGTH and token not in STOPWORDS
+    }
+
+
+def item_key(item):
+    """
+    Normalized (categoryCode, type, subtype, unit) key of an item. The category code is
+    the only category identifier every MQT format carries (bare item lists have no names).
+    """
+    return (
+        category_code(item),
+        normalize_text(item.get('typePt')),
+        normalize_text(item.get('subtypePt')),
+        normalize_unit(item.get('unit')),
+    )
+
+
+def parse_price(value):
+    if value in (None, ''):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def price_distribution(prices):
+    """Summary statistics of a list of unit prices"""
+    if not prices:
+        return None
+    prices = sorted(prices)
+    if len(prices) >= 2:
+        p25, median, p75 = statistics.quantiles(prices, n=4, method='inclusive')
+    else:
+        p25 = median = p75 = prices[0]
+    return {
+        'count': len(prices),
+        'min': prices[0],
+        'p25': round(p25, 2),
+        'median': round(median, 2),
+        'p75': round(p75, 2),
+        'max': prices[-1],
+        'mean': round(statistics.fmean(prices), 2),
+    }
+
+
+class PriceIndex:
+    """Columnar store of historical priced MQT items"""
+
+    def __init__(self):
+        self.constructions = []   # construction names
+        self.keys = []            # unique (category, type, subtype, unit) keys
+        self.vocabulary = []      # unique description tokens
+        # Columns, one entry per item
+        self.construction_ids = []
+        self.codes = []
+        self.key_ids = []
+        self.unit_prices = []
+        self.token_ids = []
+        # Lookup structures rebuilt from the columns
+        self._key_lookup = {}
+        self._token_lookup = {}
+        self._construction_lookup = {}
+        self._items_by_key = {}
+        self._items_by_unit_token = {}
+
+    def __len__(self):
+        return len(self.unit_prices)
+
+    def _intern(self, value, values, lookup):
+        index = lookup.get(value)
+        if index is None:
+            index = len(values)
+            values.append(value)
+            lookup[value] = index
+        return index
+
+    def _register(self, item_id):
+        key_id = self.key_ids[item_id]
+        unit = self.keys[key_id][3]
+        self._items_by_key.setdefault(key_id, []).append(item_id)
+        for token_id in self.token_ids[item_id]:
+            self._items_by_unit_token.setdefault((unit, token_id), []).append(item_id)
+
+    def add_items(self, construction, items):
+        """Add the priced items of one construction; items without unitPrice are ignored"""
+        construction_id = self._intern(construction, self.constructions, self._construction_lookup)
+        added = 0
+        for item in items:
+            unit_price = parse_price(item.get('unitPrice'))
+            if unit_price is None:
+                continue
+            key_id = self._intern(item_key(item), self.keys, self._key_lookup)
+            tokens = sorted(
+                self._intern(token, self.vocabulary, self._token_lookup)
+                for token in description_tokens(item.get('descriptionPt'))
+            )
+            self.construction_ids.append(construction_id)
+            self.codes.append(item.get('code', ''))
+            self.key_ids.append(key_id)
+            self.unit_prices.append(unit_price)
+            self.token_ids.append(tokens)
+            self._register(len(self.unit_prices) - 1)
+            added += 1
+        return added
+
+    def _candidates(self, item):
+        """Items with the same key, or else the items sharing most description tokens with the same unit"""
+        key = item_key(item)
+        key_id = self._key_lookup.get(key)
+        if key_id is not None:
+            return self._items_by_key[key_id]
+
+        # Rarest tokens first; very common tokens are only used if nothing else matched
+        postings = sorted(
+            (
+                self._items_by_unit_token.get((key[3], self._token_lookup[token]), ())
+                for token in description_tokens(item.get('descriptionPt'))
+                if token in self._token_lookup
+            ),
+            key=len,
+        )
+        shared = {}
+        for posting in postings:
+            if shared and len(posting) > MAX_POSTING:
+                break
+            for item_id in posting:
+                shared[item_id] = shared.get(item_id, 0) + 1
+        return heapq.nlargest(MAX_CANDIDATES, shared, key=shared.get)
+
+    def nearest(self, item, neighbors=NEIGHBORS):
+        """Nearest historical items to ``item``, ranked by description token Jaccard similarity"""
+        query = {
+            self._token_lookup[token]
+            for token in description_tokens(item.get('descriptionPt'))
+            if token in self._token_lookup
+        }
+        scored = []
+        for item_id in self._candidates(item):
+            tokens = self.token_ids[item_id]
+            shared = len(query.intersection(tokens))
+            union = len(query) + len(tokens) - shared
+            scored.append((shared / union if union else 1.0, item_id))
+
+        scored.sort(reverse=True)
+        return [
+            {
+                'construction': self.constructions[self.construction_ids[item_id]],
+                'code': self.codes[item_id],
+                'unitPrice': self.unit_prices[item_id],
+                'similarity': round(score, 3),
+            }
+            for score, item_id in scored[:neighbors]
+        ]
+
+    def price_items(self, items, neighbors=NEIGHBORS):
+        """Batch lookup: one result per item with nearest matches and price distribution"""
+        results = []
+        for item in items:
+            matches = self.nearest(item, neighbors)
+            results.append({
+                'code': item.get('code'),
+                'unit': item.get('unit'),
+                'quantity': item.get('quantity'),
+                'matches': matches,
+                'priceDistribution': price_distribution([m['unitPrice'] for m in matches]),
+            })
+        return results
+
+    def save(self, path=INDEX_FILE):
+        data = {
+            'keyFormat': KEY_FORMAT,
+            'constructions': self.constructions,
+            'keys': self.keys,
+            'vocabulary': self.vocabulary,
+            'constructionIds': self.construction_ids,
+            'codes': self.codes,
+            'keyIds': self.key_ids,
+            'unitPrices': self.unit_prices,
+            'tokenIds': self.token_ids,
+        }
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path=INDEX_FILE):
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('keyFormat') != KEY_FORMAT:
+            raise ValueError(f"{path} was built with a different item key format; rebuild it")
+        index = cls()
+        index.constructions = data['constructions']
+        index.keys = [tuple(key) for key in data['keys']]
+        index.vocabulary = data['vocabulary']
+        index.construction_ids = data['constructionIds']
+        index.codes = data['codes']
+        index.key_ids = data['keyIds']
+        index.unit_prices = data['unitPrices']
+        index.token_ids = data['tokenIds']
+        index._construction_lookup = {name: i for i, name in enumerate(index.constructions)}
+        index._key_lookup = {key: i for i, key in enumerate(index.keys)}
+        index._token_lookup = {token: i for i, token in enumerate(index.vocabulary)}
+        for item_id in range(len(index.unit_prices)):
+            index._register(item_id)
+        return index
+
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] not in ('build', 'price'):
+        print(__doc__.strip().split('Usage:')[1])
+        sys.exit(1)
+
+    if sys.argv[1] == 'build':
+        index = PriceIndex()
+        for path in sys.argv[2:]:
+            construction, items, _ = load_mqt(path)
+            added = index.add_items(construction, items)
+            print(f"Indexed {added} priced items from {construction}")
+        index.save()
+        print(f"\nPrice index: {len(index)} items, {len(index.constructions)} constructions")
+        print(f"Saved to: {INDEX_FILE}")
+        return
+
+    input_path = sys.argv[2]
+    output_path = sys.argv[3] if len(sys.argv) > 3 else str(Path(input_path).with_suffix('.prices.json'))
+    index = PriceIndex.load()
+    _, items, _ = load_mqt(input_path)
+
+    start = time.perf_counter()
+    results = index.price_items(items)
+    elapsed = time.perf_counter() - start
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+
+    priced = sum(1 for result in results if result['priceDistribution'])
+    print(f"Priced {priced}/{len(items)} items in {elapsed:.2f}s")
+    print(f"Data saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
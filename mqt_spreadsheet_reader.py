@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Read MQT (Mapa de Quantidades) directly from XLSX/CSV exports of the Google Sheets
+Streams rows one at a time (constant memory) and produces the same item structure
+as extract_mqt_from_pdf in extract-full-mqt.py, without rasterization or OCR
+"""
+
+import csv
+import json
+import re
+import sys
+import time
+import unicodedata
+from pathlib import Path
+
+# Normalized header text -> item field
+HEADER_ALIASES = {
+    'codigo': 'code',
+    'cod': 'code',
+    'code': 'code',
+    'item': 'code',
+    'ref': 'code',
+    'tipo': 'typePt',
+    'type': 'typeEn',
+    'subtipo': 'subtypePt',
+    'subtype': 'subtypeEn',
+    'zona': 'zonePt',
+    'zone': 'zoneEn',
+    'descricao': 'descriptionPt',
+    'description': 'descriptionEn',
+    'un': 'unit',
+    'und': 'unit',
+    'unid': 'unit',
+    'unidade': 'unit',
+    'unit': 'unit',
+    'quantidade': 'quantity',
+    'qtd': 'quantity',
+    'qt': 'quantity',
+    'quant': 'quantity',
+    'quantity': 'quantity',
+    'qty': 'quantity',
+}
+
+# How many leading rows to scan looking for the header row
+HEADER_SCAN_ROWS = 30
+
+CATEGORY_CODE_RE = re.compile(r'^(\d+)\.?$')
+ITEM_CODE_RE = re.compile(r'^\d+(?:\.\d+)+$')
+
+# "1,234" / "1.234": a single separator followed by exactly three digits can be either a
+# thousands group or a decimal part, depending on the locale that wrote the file
+AMBIGUOUS_QUANTITY_RE = re.compile(r'^[-+]?[1-9]\d{0,2}[.,]\d{3}$')
+
+
+def normalize_header(value):
+    """Lowercase, strip accents and keep the first part of bilingual headers ("Tipo / Type")"""
+    if value is None:
+        return ''
+    text = unicodedata.normalize('NFKD', str(value))
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    text = re.split(r'[/\n(]', text)[0]
+    return re.sub(r'[^a-z]', '', text)
+
+
+def parse_quantity(value):
+    """
+    Parse a quantity cell, accepting numbers and PT ("1.234,56") or EN ("1,234.56")
+    formatted strings. With both separators the last one is the decimal separator; values
+    that read differently in each locale ("1,234") raise ValueError instead of being guessed.
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip().replace('\u00a0', '').replace(' ', '')
+    if AMBIGUOUS_QUANTITY_RE.match(text):
+        raise ValueError(f"Ambiguous quantity {text!r}: thousands or decimal separator")
+    if ',' in text and '.' in text:
+        thousands = '.' if text.rfind(',') > text.rfind('.') else ','
+        text = text.replace(thousands, '')
+    separator = ',' if ',' in text else '.'
+    if text.count(separator) > 1:
+        # Repeated separator: thousands groups only ("1.234.567")
+        text = text.replace(separator, '')
+    text = text.replace(',', '.')
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def cell_text(value):
+    """Convert a raw cell to stripped text"""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def iter_csv_rows(csv_path):
+    """Yield CSV rows as lists, detecting the delimiter (Sheets uses ',' and PT Excel ';')"""
+    with open(csv_path, newline='', encoding='utf-8-sig') as f:
+        sample = f.read(8192)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+        except csv.Error:
+            dialect = csv.excel
+        for row in csv.reader(f, dialect):
+            yield row
+
+
+def iter_xlsx_rows(xlsx_path, sheet_name=None):
+    """Yield XLSX rows as tuples of values using openpyxl read-only mode"""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(xlsx_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+        for row in sheet.iter_rows(values_only=True):
+            yield row
+    finally:
+        workbook.close()
+
+
+def iter_spreadsheet_rows(path, sheet_name=None):
+    """Yield raw rows from an XLSX or CSV file"""
+    suffix = Path(path).suffix.lower()
+    if suffix in ('.xlsx', '.xlsm'):
+        return iter_xlsx_rows(path, sheet_name)
+    if suffix in ('.csv', '.txt'):
+        return iter_csv_rows(path)
+    raise ValueError(f"Unsupported spreadsheet format: {suffix}")
+
+
+def find_column_map(header_row):
+    """Map column indexes to item fields; returns None if this is not a header row"""
+    column_map = {}
+    for index, value in enumerate(header_row):
+        field = HEADER_ALIASES.get(normalize_header(value))
+        if field and field not in column_map.values():
+            column_map[index] = field
+    fields = set(column_map.values())
+    if 'code' in fields and ('descriptionPt' in fields or 'descriptionEn' in fields):
+        return column_map
+    return None
+
+
+def split_category_name(name):
+    """Split "DEMOLIÇÕES / DEMOLITIONS" into PT and EN names"""
+    if '/' in name:
+        parts = name.split('/', 1)
+        return parts[0].strip(), parts[1].strip()
+    return name.strip(), ''
+
+
+def iter_mqt_items(path, sheet_name=None, categories=None):
+    """
+    Stream MQT items from a spreadsheet export.
+
+    Yields dicts with the same keys as extract_mqt_from_pdf. Category header rows
+    (a bare number like "1" with no unit/quantity) set the current category and,
+    if a list is given in ``categories``, are appended to it.
+    """
+    rows = iter_spreadsheet_rows(path, sheet_name)
+    column_map = None
+
+    for row_index, row in enumerate(rows):
+        column_map = find_column_map(row)
+        if column_map:
+            break
+        if row_index >= HEADER_SCAN_ROWS:
+            break
+
+    if not column_map:
+        raise ValueError(f"Could not find MQT header row in {path}")
+    if 'quantity' not in column_map.values():
+        raise ValueError(
+            f"MQT header row in {path} has no quantity column "
+            f"(expected one of: Quantidade, Qtd, Quant, Quantity, Qty)"
+        )
+
+    current_category_code = None
+    item_counter = 0
+
+    for row in rows:
+        values = {}
+        for index, field in column_map.items():
+            if index < len(row):
+                values[field] = row[index]
+
+        code = cell_text(values.get('code')).rstrip('.')
+        if not code:
+            continue
+
+        try:
+            quantity = parse_quantity(values.get('quantity'))
+        except ValueError as e:
+            raise ValueError(f"{path}, item {code}: {e}") from None
+        unit = cell_text(values.get('unit'))
+
+        category_match = CATEGORY_CODE_RE.match(code)
+        if category_match and quantity is None and not unit:
+            current_category_code = category_match.group(1)
+            if categories is not None:
+                name_pt = cell_text(values.get('descriptionPt')) or cell_text(values.get('typePt'))
+                name_en = cell_text(values.get('descriptionEn')) or cell_text(values.get('typeEn'))
+                if not name_en:
+                    name_pt, name_en = split_category_name(name_pt)
+                categories.append({
+                    'code': current_category_code,
+                    'namePt': name_pt,
+                    'nameEn': name_en,
+                    'order': len(categories) + 1,
+                })
+            continue
+
+        if not ITEM_CODE_RE.match(code) or quantity is None:
+            continue
+
+        item_counter += 1
+        yield {
+            'code': code,
+            'categoryCode': current_category_code or code.split('.')[0],
+            'typePt': cell_text(values.get('typePt')),
+            'typeEn': cell_text(values.get('typeEn')),
+            'subtypePt': cell_text(values.get('subtypePt')),
+            'subtypeEn': cell_text(values.get('subtypeEn')),
+            'zonePt': cell_text(values.get('zonePt')),
+            'zoneEn': cell_text(values.get('zoneEn')),
+            'descriptionPt': cell_text(values.get('descriptionPt')),
+            'descriptionEn': cell_text(values.get('descriptionEn')),
+            'unit': unit,
+            'quantity': quantity,
+            'order': item_counter,
+        }
+
+
+def extract_mqt_from_spreadsheet(path, sheet_name=None):
+    """Extract all MQT items from an XLSX/CSV export (list form of iter_mqt_items)"""
+    return list(iter_mqt_items(path, sheet_name))
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("Usage: mqt_spreadsheet_reader.py <input.xlsx|input.csv> <output.json> [sheet name]")
+        sys.exit(1)
+
+    input_path = sys.argv[1]
+    output_path = sys.argv[2]
+    sheet_name = sys.argv[3] if len(sys.argv) > 3 else None
+
+    print(f"Reading MQT from spreadsheet: {input_path}")
+    start = time.perf_counter()
+    categories = []
+    items = list(iter_mqt_items(input_path, sheet_name, categories))
+    elapsed = time.perf_counter() - start
+
+    print(f"Total categories found: {len(categories) or len(set(item['categoryCode'] for item in items))}")
+    print(f"Total items extracted: {len(items)} in {elapsed * 1000:.0f} ms")
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(items, f, ensure_ascii=False, indent=2)
+
+    print(f"\nData saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
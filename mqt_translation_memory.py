@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Bilingual translation memory for MQT items
+Indexes PT -> EN segment pairs (type, subtype, zone, description) from past MQTs and
+fills the empty EN fields of newly extracted items (e.g. from the OCR path in
+extract-full-mqt.py). Near matches are found with character n-gram MinHash + LSH
+banding, so lookups stay sublinear with 100k+ stored segments.
+
+MQT descriptions share long boilerplate tails, so a high MinHash score alone does not
+mean the same item: only exact or near-exact matches (same content tokens) fill the EN
+field, anything weaker is stored in 'translationSuggestions' for review.
+
+Usage:
+  python3 mqt_translation_memory.py build <mqt.json> [<mqt.json> ...]
+  python3 mqt_translation_memory.py fill <mqt.json> [<output.json>]
+  python3 mqt_translation_memory.py check <mqt.json>     # leave-one-out auto-fill check
+  python3 mqt_translation_memory.py --benchmark [N]
+"""
+
+import gzip
+import json
+import random
+import re
+import sys
+import time
+import unicodedata
+import zlib
+
+from mqt_items import is_nested, load_mqt, parse_mqt, save_mqt
+
+TM_FILE = "/home/ubuntu/gavinho_project_manager/mqt-translation-memory.json.gz"
+
+# PT field -> EN field in the item format produced by the extractors
+FIELD_PAIRS = [
+    ('typePt', 'typeEn'),
+    ('subtypePt', 'subtypeEn'),
+    ('zonePt', 'zoneEn'),
+    ('descriptionPt', 'descriptionEn'),
+]
+
+NGRAM_SIZE = 4
+NUM_BINS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_BINS // BANDS
+MAX_CANDIDATES = 20
+# Buckets larger than this (shared boilerplate) are skipped unless no other band matches
+MAX_BUCKET_SIZE = 500
+# Lowest score kept as a suggestion
+MIN_SCORE = 0.6
+# Lowest score filled automatically, and only if the content tokens are the same
+AUTO_FILL_SCORE = 0.8
+
+# Words whose presence or absence does not change which item a segment describes
+STOPWORDS = {
+    'a', 'o', 'as', 'os', 'ao', 'aos', 'de', 'da', 'do', 'das', 'dos', 'e', 'em', 'no', 'na',
+    'nos', 'nas', 'com', 'para', 'por', 'conforme', 'acordo',
+}
+
+_EMPTY_BIN = 0xFFFFFFFF
+
+
+def normalize_text(text):
+    """Lowercase, strip accents and collapse whitespace"""
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def content_tokens(normalized):
+    """Tokens of a normalized segment that tell items apart (numbers included, stopwords not)"""
+    return set(re.findall(r'[a-z0-9]+', normalized)) - STOPWORDS
+
+
+def minhash_signature(normalized):
+    """
+    One-permutation MinHash: each n-gram hash goes to one of NUM_BINS bins and each
+    bin keeps its minimum, so the cost is one hash per n-gram. Empty bins borrow
+    from the next non-empty bin (densification) to keep signatures comparable.
+    """
+    padded = f" {normalized} "
+    bins = [_EMPTY_BIN] * NUM_BINS
+    for i in range(max(1, len(padded) - NGRAM_SIZE + 1)):
+        h = zlib.crc32(padded[i:i + NGRAM_SIZE].encode('utf-8'))
+        index = h % NUM_BINS
+        value = h // NUM_BINS
+        if value < bins[index]:
+            bins[index] = value
+
+    if _EMPTY_BIN in bins:
+        original = bins[:]
+        for index in range(NUM_BINS):
+            offset = 1
+            while bins[index] == _EMPTY_BIN and offset < NUM_BINS:
+                source = original[(index + offset) % NUM_BINS]
+                if source != _EMPTY_BIN:
+                    bins[index] = source + offset
+                offset += 1
+    return tuple(bins)
+
+
+def estimate_similarity(signature_a, signature_b):
+    """Estimated Jaccard similarity between two signatures"""
+    equal = sum(1 for x, y in zip(signature_a, signature_b) if x == y)
+    return equal / NUM_BINS
+
+
+def band_keys(signature):
+    """LSH band keys of a signature"""
+    return [
+        (band, signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND])
+        for band in range(BANDS)
+    ]
+
+
+class TranslationMemory:
+    """PT -> EN segment store with exact and MinHash-LSH lookup"""
+
+    def __init__(self):
+        self.sources = []      # original PT text per segment id
+        self.targets = []      # EN text per segment id
+        self.signatures = []   # MinHash signature per segment id
+        self.exact = {}        # normalized PT -> segment id
+        self.buckets = {}      # (band, rows) -> list of segment ids
+        self.layout = (NGRAM_SIZE, NUM_BINS, BANDS)
+
+    def __len__(self):
+        return len(self.sources)
+
+    def add(self, source, target):
+        """Add a PT/EN pair; repeated PT segments keep their first translation"""
+        if not source or not target:
+            return
+        normalized = normalize_text(source)
+        if not normalized or normalized in self.exact:
+            return
+
+        self.sources.append(source)
+        self.targets.append(target)
+        self.signatures.append(minhash_signature(normalized))
+        self._register(len(self.sources) - 1, normalized)
+
+    def _register(self, segment_id, normalized):
+        self.exact[normalized] = segment_id
+        for key in band_keys(self.signatures[segment_id]):
+            self.buckets.setdefault(key, []).append(segment_id)
+
+    def add_items(self, items, field_pairs=FIELD_PAIRS):
+        """Add all PT/EN pairs found in a list of MQT items"""
+        for item in items:
+            for pt_field, en_field in field_pairs:
+                self.add((item.get(pt_field) or '').strip(), (item.get(en_field) or '').strip())
+
+    def add_mqt_file(self, path):
+        """Add the category names and items of an MQT JSON file in any of the repo's formats"""
+        _, items, categories = load_mqt(path)
+        for category in categories:
+            self.add(category['namePt'].strip(), category['nameEn'].strip())
+        self.add_items(items)
+
+    def _best_match(self, normalized, exclude=None):
+        """(segment id, score, exact) of the closest stored segment, or (None, 0.0, False)"""
+        segment_id = self.exact.get(normalized)
+        if segment_id is not None and segment_id != exclude:
+            return segment_id, 1.0, True
+
+        signature = minhash_signature(normalized)
+        buckets = [self.buckets.get(key, ()) for key in band_keys(signature)]
+        selective = [bucket for bucket in buckets if 0 < len(bucket) <= MAX_BUCKET_SIZE]
+        if not selective:
+            # Only boilerplate bands matched: scan a bounded slice of the smallest one
+            matched = [bucket for bucket in buckets if bucket]
+            if not matched:
+                return None, 0.0, False
+            selective = [min(matched, key=len)[:MAX_BUCKET_SIZE]]
+
+        votes = {}
+        for bucket in selective:
+            for candidate in bucket:
+                if candidate != exclude:
+                    votes[candidate] = votes.get(candidate, 0) + 1
+        if not votes:
+            return None, 0.0, False
+
+        candidates = sorted(votes, key=votes.get, reverse=True)[:MAX_CANDIDATES]
+        best_id = max(candidates, key=lambda c: estimate_similarity(signature, self.signatures[c]))
+        # An estimate of 1.0 is not proof of equality: only the exact table is
+        return best_id, estimate_similarity(signature, self.signatures[best_id]), False
+
+    def _match(self, normalized, min_score, exclude=None):
+        """(translation, score, auto) for a normalized PT segment; see lookup()"""
+        segment_id, score, exact = self._best_match(normalized, exclude)
+        if segment_id is None or score < min_score:
+            return None, 0.0, False
+        auto = exact or (
+            score >= AUTO_FILL_SCORE
+            and content_tokens(normalized) == content_tokens(normalize_text(self.sources[segment_id]))
+        )
+        return self.targets[segment_id], score, auto
+
+    def lookup(self, text, min_score=MIN_SCORE):
+        """
+        Find the best translation for a PT segment.
+        Returns (translation, score, auto), or (None, 0.0, False) if nothing reaches min_score.
+        auto is True for exact matches and near-exact ones (score >= AUTO_FILL_SCORE with
+        the same content tokens), the only ones safe to write without review.
+        """
+        normalized = normalize_text(text or '')
+        if not normalized:
+            return None, 0.0, False
+        return self._match(normalized, min_score)
+
+    def fill_items(self, items, min_score=MIN_SCORE):
+        """
+        Fill empty EN fields in place with exact and near-exact matches; each filled item
+        gets a 'translationScores' dict with the score per filled field. Weaker matches
+        leave the field empty and go to 'translationSuggestions' ({field: {text, score}}).
+        Returns (fields filled, fields with a suggestion).
+        """
+        filled = suggested = 0
+        for item in items:
+            scores = {}
+            suggestions = {}
+            for pt_field, en_field in FIELD_PAIRS:
+                if item.get(en_field) or not item.get(pt_field):
+                    continue
+                translation, score, auto = self.lookup(item[pt_field], min_score)
+                if translation and auto:
+                    item[en_field] = translation
+                    scores[en_field] = round(score, 3)
+                elif translation:
+                    suggestions[en_field] = {'text': translation, 'score': round(score, 3)}
+            if scores:
+                item['translationScores'] = scores
+                filled += len(scores)
+            if suggestions:
+                item['translationSuggestions'] = suggestions
+                suggested += len(suggestions)
+        return filled, suggested
+
+    def save(self, path=TM_FILE):
+        """Compact gzip JSON, like the price index; lookup structures are rebuilt on load"""
+        data = {
+            'layout': self.layout,
+            'sources': self.sources,
+            'targets': self.targets,
+            'signatures': self.signatures,
+        }
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path=TM_FILE):
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+        memory = cls()
+        if tuple(data['layout']) != memory.layout:
+            raise ValueError(f"{path} was built with a different signature layout; rebuild it")
+        memory.sources = data['sources']
+        memory.targets = data['targets']
+        memory.signatures = [tuple(signature) for signature in data['signatures']]
+        for segment_id, source in enumerate(memory.sources):
+            memory._register(segment_id, normalize_text(source))
+        return memory
+
+
+def leave_one_out(path):
+    """
+    Check auto-fill on a real MQT: each PT/EN pair of the file is looked up in a memory
+    of all the other pairs, as if it were a new item. Returns the counts printed by main().
+    """
+    _, items, categories = load_mqt(path)
+    pairs = [(category['namePt'], category['nameEn']) for category in categories]
+    pairs += [
+        (item.get(pt_field) or '', item.get(en_field) or '')
+        for item in items
+        for pt_field, en_field in FIELD_PAIRS
+    ]
+    pairs = [(source.strip(), target.strip()) for source, target in pairs]
+    pairs = [(source, target) for source, target in pairs if source and target]
+
+    memory = TranslationMemory()
+    for source, target in pairs:
+        memory.add(source, target)
+    occurrences = {}
+    for source, _ in pairs:
+        normalized = normalize_text(source)
+        occurrences[normalized] = occurrences.get(normalized, 0) + 1
+
+    counts = {'pairs': len(pairs), 'filled': 0, 'wrong': 0, 'suggested': 0, 'unmatched': 0}
+    for source, target in pairs:
+        normalized = normalize_text(source)
+        # Repeated segments stay in the memory through their other occurrences
+        exclude = memory.exact[normalized] if occurrences[normalized] == 1 else None
+        translation, _, auto = memory._match(normalized, MIN_SCORE, exclude)
+        if not translation:
+            counts['unmatched'] += 1
+        elif not auto:
+            counts['suggested'] += 1
+        elif normalize_text(translation) == normalize_text(target):
+            counts['filled'] += 1
+        else:
+            counts['wrong'] += 1
+            print(f"  ✗ {source[:60]!r} -> {translation[:60]!r}")
+    return counts
+
+
+def benchmark(count=100000, queries=1000):
+    """
+    Lookups against segments that all share the same MQT boilerplate tail, which is the
+    worst case for LSH bucket sizes. Queries are stored segments with a boilerplate-only
+    edit (must auto-fill) and with one content word swapped (must not).
+    """
+    rng = random.Random(0)
+    boilerplate = (
+        ", incluindo carga e transporte de entulho a vazadouro, em camião a aterro específico "
+        "ou operador licenciado de gestão de resíduos, situado a uma distância máxima de 10 km, "
+        "conforme projecto;"
+    )
+    verbs = ['Demolição de', 'Remoção de', 'Desmontagem de', 'Abertura de roços em']
+    vocabulary = [
+        ''.join(rng.choice('abcdefghijlmnoprstuv') for _ in range(rng.randint(4, 10)))
+        for _ in range(5000)
+    ]
+    words = [rng.choices(vocabulary, k=6) for _ in range(count)]
+    sources = [f"{rng.choice(verbs)} {' '.join(w)}{boilerplate}" for w in words]
+
+    memory = TranslationMemory()
+    start = time.perf_counter()
+    for i, source in enumerate(sources):
+        memory.add(source, f"EN {i}")
+    build_time = time.perf_counter() - start
+
+    picks = rng.sample(range(count), queries)
+    start = time.perf_counter()
+    correct = 0
+    for i in picks:
+        translation, _, auto = memory.lookup(sources[i].replace('conforme', 'de acordo com o'))
+        correct += auto and translation == f"EN {i}"
+    lookup_time = (time.perf_counter() - start) / queries
+
+    wrong = 0
+    for i in picks:
+        near_miss = sources[i].replace(words[i][0], rng.choice(vocabulary), 1)
+        wrong += memory.lookup(near_miss)[2]
+
+    largest = max(len(bucket) for bucket in memory.buckets.values())
+    print(f"Segments: {len(memory):,}  build: {build_time:.1f}s  largest bucket: {largest:,}")
+    print(f"Lookup: {lookup_time * 1000:.2f} ms  auto-filled correctly: {correct}/{queries}  "
+          f"near misses auto-filled: {wrong}/{queries}")
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--benchmark':
+        benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 100000)
+        return
+
+    if len(sys.argv) < 3 or sys.argv[1] not in ('build', 'fill', 'check'):
+        print(__doc__.strip().split('Usage:')[1])
+        sys.exit(1)
+
+    if sys.argv[1] == 'build':
+        memory = TranslationMemory()
+        start = time.perf_counter()
+        for path in sys.argv[2:]:
+            memory.add_mqt_file(path)
+            print(f"Indexed {path}")
+        memory.save()
+        print(f"\nTranslation memory: {len(memory)} segments in {time.perf_counter() - start:.2f}s")
+        print(f"Saved to: {TM_FILE}")
+        return
+
+    if sys.argv[1] == 'check':
+        counts = leave_one_out(sys.argv[2])
+        print(f"Pairs: {counts['pairs']}  auto-filled: {counts['filled']}  wrong: {counts['wrong']}  "
+              f"suggested: {counts['suggested']}  unmatched: {counts['unmatched']}")
+        sys.exit(1 if counts['wrong'] else 0)
+
+    input_path = sys.argv[2]
+    output_path = sys.argv[3] if len(sys.argv) > 3 else input_path
+    with open(input_path, encoding='utf-8') as f:
+        data = json.load(f)
+    if is_nested(data):
+        print(f"❌ {input_path} is a nested snake_case MQT; fill works on item lists and flat MQT files")
+        sys.exit(1)
+    _, items, _ = parse_mqt(data)
+    metadata = None if isinstance(data, list) else {k: v for k, v in data.items() if k != 'items'}
+    memory = TranslationMemory.load()
+
+    start = time.perf_counter()
+    filled, suggested = memory.fill_items(items)
+    elapsed = time.perf_counter() - start
+
+    save_mqt(output_path, items, metadata)
+
+    print(f"Filled {filled} EN fields in {len(items)} items ({elapsed * 1000:.0f} ms), "
+          f"{suggested} suggestions to review")
+    print(f"Data saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
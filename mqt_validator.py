@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Batch validator for mqtValidationRules on extracted MQT items
+Compiles a construction's enabled rules once (parsed conditions, pre-compiled regexes,
+category masks) and checks the whole item set in one pass over NumPy columns, with a
+hash map for duplicate detection. Rule semantics follow client/src/lib/mqtValidationService.ts.
+
+Usage:
+  python3 mqt_validator.py <items.json> [<rules.json>]
+  python3 mqt_validator.py --benchmark [N]
+"""
+
+import json
+import re
+import sys
+import time
+
+import numpy as np
+
+from mqt_columnar import TEXT_FIELDS, MqtItemTable
+from mqt_items import load_mqt
+
+SEVERITIES = ('error', 'warning', 'info')
+
+# Same defaults as getDefaultValidationRules() in the client
+DEFAULT_RULES = [
+    {
+        'name': 'Preço Mínimo Razoável',
+        'ruleType': 'price_min',
+        'field': 'unitPrice',
+        'condition': json.dumps({'value': 0.01}),
+        'severity': 'warning',
+        'message': 'Preço unitário muito baixo - verificar se está correto',
+        'enabled': True,
+    },
+    {
+        'name': 'Preço Máximo Suspeito',
+        'ruleType': 'price_max',
+        'field': 'unitPrice',
+        'condition': json.dumps({'value': 10000}),
+        'severity': 'warning',
+        'message': 'Preço unitário muito alto - verificar se está correto',
+        'enabled': True,
+    },
+    {
+        'name': 'Quantidade Mínima',
+        'ruleType': 'quantity_min',
+        'field': 'quantity',
+        'condition': json.dumps({'value': 0.01}),
+        'severity': 'error',
+        'message': 'Quantidade deve ser maior que zero',
+        'enabled': True,
+    },
+    {
+        'name': 'Código Duplicado',
+        'ruleType': 'duplicate_check',
+        'field': 'code',
+        'condition': json.dumps({'fields': ['code']}),
+        'severity': 'warning',
+        'message': 'Código duplicado encontrado',
+        'enabled': True,
+    },
+]
+
+# ruleType -> (column attribute, field name, comparison, default message)
+RANGE_RULES = {
+    'price_min': ('unit_price', 'unitPrice', np.less,
+                  'Preço unitário ({value}€) abaixo do mínimo permitido ({limit}€)'),
+    'price_max': ('unit_price', 'unitPrice', np.greater,
+                  'Preço unitário ({value}€) acima do máximo permitido ({limit}€)'),
+    'quantity_min': ('quantity', 'quantity', np.less,
+                     'Quantidade ({value}) abaixo do mínimo permitido ({limit})'),
+    'quantity_max': ('quantity', 'quantity', np.greater,
+                     'Quantidade ({value}) acima do máximo permitido ({limit})'),
+}
+
+
+def _strings(column):
+    return [column.values[code] for code in column.codes]
+
+
+def _numbers(array):
+    """Plain Python values with NaN as None, so missing numbers compare equal"""
+    values = array.astype(object)
+    values[np.isnan(array)] = None
+    return values.tolist()
+
+
+def _text(field):
+    return lambda table: _strings(table.text[field])
+
+
+def _extra(field):
+    return lambda table: [(extras or {}).get(field) for extras in table.extras or [None] * len(table)]
+
+
+# Item fields available to duplicate_check keys, as table accessors
+KEY_FIELDS = {
+    'code': lambda table: table.codes,
+    'categoryCode': lambda table: _strings(table.categories),
+    'unit': lambda table: _strings(table.units),
+    'quantity': lambda table: _numbers(table.quantity),
+    'unitPrice': lambda table: _numbers(table.unit_price),
+    'totalPrice': lambda table: _numbers(table.quantity * table.unit_price),
+    'quantityExecuted': lambda table: _numbers(table.quantity_executed),
+    'order': lambda table: table.order.tolist(),
+    'supplier': _extra('supplier'),
+    'notes': _extra('notes'),
+    **{field: _text(field) for field in TEXT_FIELDS},
+}
+
+# MQTImportRow field names used by rules created in the client -> item fields
+KEY_FIELD_ALIASES = {
+    'category': 'categoryCode',
+    'type': 'typePt',
+    'subtype': 'subtypePt',
+    'zone': 'zonePt',
+    'description': 'descriptionPt',
+}
+
+
+class CompiledRule:
+    """One enabled rule with its condition parsed and regex compiled"""
+
+    def __init__(self, rule):
+        self.name = rule.get('name') or rule['ruleType']
+        self.rule_type = rule['ruleType']
+        self.severity = rule.get('severity') or 'warning'
+        self.message = rule.get('message')
+        self.category = rule.get('category')
+        condition = rule.get('condition') or '{}'
+        self.condition = json.loads(condition) if isinstance(condition, str) else condition
+
+        if self.rule_type in RANGE_RULES:
+            self.limit = float(self.condition['value'])
+        elif self.rule_type == 'code_pattern':
+            self.pattern = re.compile(self.condition['pattern'])
+        elif self.rule_type == 'duplicate_check':
+            self.fields = self.condition.get('fields') or [rule.get('field') or 'code']
+            self.key_fields = [KEY_FIELD_ALIASES.get(field, field) for field in self.fields]
+            unknown = [field for field in self.key_fields if field not in KEY_FIELDS]
+            if unknown:
+                raise ValueError(f"Unknown duplicate_check field(s): {', '.join(unknown)}")
+        else:
+            raise ValueError(f"Unknown rule type: {self.rule_type}")
+
+    def _scope(self, table):
+        """Boolean mask of the items this rule applies to (category filter)"""
+        if not self.category:
+            return np.ones(len(table), dtype=bool)
+        values = table.categories.values
+        if self.category in values:
+            return table.categories.codes == values.index(self.category)
+        return np.zeros(len(table), dtype=bool)
+
+    def check(self, table):
+        """Return the list of violations of this rule over the whole table"""
+        if self.rule_type in RANGE_RULES:
+            attribute, field, compare, template = RANGE_RULES[self.rule_type]
+            column = getattr(table, attribute)
+            # NaN compares False, so unpriced items are skipped like in the client
+            indexes = np.flatnonzero(compare(column, self.limit) & self._scope(table))
+            return [
+                self._violation(table, i, field, template.format(value=column[i], limit=self.limit))
+                for i in indexes
+            ]
+
+        if self.rule_type == 'code_pattern':
+            search = self.pattern.search
+            scope = self._scope(table)
+            indexes = [
+                i for i, code in enumerate(table.codes)
+                if scope[i] and not search(code)
+            ]
+            return [
+                self._violation(
+                    table, i, 'code',
+                    f'Código "{table.codes[i]}" não corresponde ao padrão esperado ({self.pattern.pattern})',
+                )
+                for i in indexes
+            ]
+
+        # duplicate_check: hash map of key -> item indexes over all items
+        columns = [KEY_FIELDS[field](table) for field in self.key_fields]
+        seen = {}
+        for i, key in enumerate(zip(*columns)):
+            seen.setdefault(key, []).append(i)
+        violations = []
+        field = ', '.join(self.fields)
+        for indexes in seen.values():
+            if len(indexes) > 1:
+                rows = ', '.join(str(i + 1) for i in indexes)
+                for i in indexes:
+                    violations.append(self._violation(
+                        table, i, field, f'Item duplicado encontrado (itens: {rows})'
+                    ))
+        return violations
+
+    def _violation(self, table, index, field, default_message):
+        return {
+            'index': int(index),
+            'code': table.codes[index],
+            'categoryCode': table.categories[index],
+            'field': field,
+            'message': self.message or default_message,
+        }
+
+
+class CompiledRuleSet:
+    """A construction's enabled rules, compiled once and applied to whole item sets"""
+
+    def __init__(self, rules):
+        self.rules = []
+        self.skipped = []
+        for rule in rules:
+            if not rule.get('enabled', True):
+                continue
+            try:
+                self.rules.append(CompiledRule(rule))
+            except (KeyError, TypeError, ValueError, re.error) as e:
+                self.skipped.append({'name': rule.get('name'), 'error': str(e)})
+
+    def validate(self, items):
+        """
+        Validate a list of items (or an MqtItemTable).
+        Returns {'error': {rule name: [violations]}, 'warning': {...}, 'info': {...}}.
+        """
+        table = items if isinstance(items, MqtItemTable) else MqtItemTable.from_items(items)
+        results = {severity: {} for severity in SEVERITIES}
+        for rule in self.rules:
+            violations = rule.check(table)
+            if violations:
+                results.setdefault(rule.severity, {}).setdefault(rule.name, []).extend(violations)
+        return results
+
+
+def summarize(results):
+    """Number of violations per severity"""
+    return {
+        severity: sum(len(violations) for violations in rules.values())
+        for severity, rules in results.items()
+    }
+
+
+def benchmark(count=100000):
+    """Validate synthetic items against the default rules plus a code pattern rule"""
+    rng = np.random.default_rng(0)
+    quantities = rng.uniform(-1, 500, count).round(2)
+    prices = rng.uniform(0, 12000, count).round(2)
+    items = [
+        {
+            'code': f"{i % 25 + 1}.{i // 25 + 1}" if i % 1000 else '3.1',
+            'categoryCode': str(i % 25 + 1),
+            'unit': 'm2',
+            'quantity': float(quantities[i]),
+            'unitPrice': float(prices[i]),
+        }
+        for i in range(count)
+    ]
+    rules = DEFAULT_RULES + [{
+        'name': 'Código numérico',
+        'ruleType': 'code_pattern',
+        'field': 'code',
+        'condition': json.dumps({'pattern': r'^\d+(\.\d+)+$'}),
+        'severity': 'info',
+        'enabled': True,
+    }]
+
+    start = time.perf_counter()
+    rule_set = CompiledRuleSet(rules)
+    table = MqtItemTable.from_items(items)
+    load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = rule_set.validate(table)
+    validate_time = time.perf_counter() - start
+
+    print(f"Items: {count:,}  rules: {len(rule_set.rules)}")
+    print(f"Compile + columnar load: {load_time * 1000:.1f} ms")
+    print(f"Validation: {validate_time * 1000:.1f} ms  {summarize(results)}")
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__.strip().split('Usage:')[1])
+        sys.exit(1)
+
+    if sys.argv[1] == '--benchmark':
+        benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 100000)
+        return
+
+    _, items, _ = load_mqt(sys.argv[1])
+    if not items:
+        print(f"❌ No MQT items found in {sys.argv[1]}")
+        sys.exit(1)
+    table = MqtItemTable.from_items(items)
+    rules = DEFAULT_RULES
+    if len(sys.argv) > 2:
+        with open(sys.argv[2], encoding='utf-8') as f:
+            rules = json.load(f)
+
+    rule_set = CompiledRuleSet(rules)
+    for skipped in rule_set.skipped:
+        print(f"⚠️  Rule ignored: {skipped['name']} ({skipped['error']})")
+
+    results = rule_set.validate(table)
+    for severity in SEVERITIES:
+        for name, violations in results[severity].items():
+            print(f"\n[{severity}] {name}: {len(violations)}")
+            for violation in violations[:10]:
+                print(f"  {violation['code']} (cat. {violation['categoryCode']}): {violation['message']}")
+            if len(violations) > 10:
+                print(f"  ... {len(violations) - 10} more")
+
+    print(f"\nSummary ({len(table)} items): {summarize(results)}")
+
+
+if __name__ == "__main__":
+    main()
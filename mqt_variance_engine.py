@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Batch variance and alert engine for mqtLines
+Computes variance, variancePercentage and the on_track/warning/critical status for all
+lines at once (NumPy, no per-row loop), emits the mqtAlerts rows (variance_high,
+variance_critical, missing_data) and writes both back in batches.
+
+Usage:
+  python3 mqt_variance_engine.py <lines.json> [<output.json>] [--warning 10] [--critical 20]
+  python3 mqt_variance_engine.py --benchmark [N]
+"""
+
+import json
+import sys
+import time
+
+import numpy as np
+
+# Same defaults as server/services/mqtImportService.ts (percent, inclusive)
+VARIANCE_THRESHOLD_WARNING = 10.0
+VARIANCE_THRESHOLD_CRITICAL = 20.0
+
+# variancePercentage is decimal(5, 2) in the schema
+MAX_VARIANCE_PERCENTAGE = 999.99
+
+WRITE_BATCH_SIZE = 1000
+
+STATUS_NAMES = np.array(['on_track', 'warning', 'critical'])
+STATUS_ON_TRACK, STATUS_WARNING, STATUS_CRITICAL = 0, 1, 2
+
+UPDATE_LINES_SQL = (
+    "UPDATE mqtLines SET variance = %s, variancePercentage = %s, status = %s WHERE id = %s"
+)
+INSERT_ALERTS_SQL = (
+    "INSERT INTO mqtAlerts (mqtLineId, projectId, alertType, severity, message, isResolved) "
+    "VALUES (%s, %s, %s, %s, %s, 0)"
+)
+SELECT_OPEN_ALERTS_SQL = (
+    "SELECT id, mqtLineId, alertType FROM mqtAlerts "
+    "WHERE isResolved = 0 AND mqtLineId IN ({}) FOR UPDATE"
+)
+RESOLVE_ALERTS_SQL = "UPDATE mqtAlerts SET isResolved = 1, resolvedAt = NOW() WHERE id = %s"
+
+
+def to_float_array(values):
+    """Convert decimal strings/numbers (None or '' for missing) to a float64 array with NaN"""
+    values = list(values)
+    return np.fromiter(
+        (np.nan if value is None or value == '' else float(value) for value in values),
+        np.float64,
+        len(values),
+    )
+
+
+def compute_variance(planned, executed, warning=VARIANCE_THRESHOLD_WARNING,
+                     critical=VARIANCE_THRESHOLD_CRITICAL):
+    """
+    Vectorized variance for arrays of planned/executed quantities.
+
+    Returns (variance, variance_percentage, status_codes, missing). Lines with planned == 0
+    get variance 0 and 0% (as calculateVariance in the import service); lines with a
+    missing quantity get NaN variance, on_track status and missing=True.
+    """
+    missing = np.isnan(planned) | np.isnan(executed)
+    variance = executed - planned
+    variance[planned == 0] = 0.0
+
+    percentage = np.zeros_like(variance)
+    np.divide(variance * 100.0, planned, out=percentage, where=~missing & (planned != 0))
+    percentage[missing] = np.nan
+    np.clip(percentage, -MAX_VARIANCE_PERCENTAGE, MAX_VARIANCE_PERCENTAGE, out=percentage)
+
+    magnitude = np.abs(np.nan_to_num(percentage))
+    status = np.full(variance.shape, STATUS_ON_TRACK, dtype=np.int8)
+    status[magnitude >= warning] = STATUS_WARNING
+    status[magnitude >= critical] = STATUS_CRITICAL
+    return variance, percentage, status, missing
+
+
+class VarianceResult:
+    """Computed columns for a batch of mqtLines"""
+
+    def __init__(self, line_ids, project_ids, item_codes, variance, percentage, status, missing):
+        self.line_ids = line_ids
+        self.project_ids = project_ids
+        self.item_codes = item_codes
+        self.variance = variance
+        self.percentage = percentage
+        self.status = status
+        self.missing = missing
+
+    def __len__(self):
+        return len(self.line_ids)
+
+    def status_counts(self):
+        counts = np.bincount(self.status, minlength=len(STATUS_NAMES))
+        return {str(name): int(count) for name, count in zip(STATUS_NAMES, counts)}
+
+    def line_updates(self):
+        """(variance, variancePercentage, status, id) tuples for UPDATE_LINES_SQL"""
+        # NaN -> None through an object array, then plain Python values via tolist()
+        variance = np.round(self.variance, 2).astype(object)
+        variance[self.missing] = None
+        percentage = np.round(self.percentage, 2).astype(object)
+        percentage[self.missing] = None
+        return list(zip(
+            variance.tolist(),
+            percentage.tolist(),
+            STATUS_NAMES[self.status].tolist(),
+            self.line_ids.tolist(),
+        ))
+
+    def alerts(self):
+        """mqtAlerts rows; only flagged lines are visited"""
+        rows = []
+        for index in np.flatnonzero(self.missing):
+            rows.append({
+                'mqtLineId': int(self.line_ids[index]),
+                'projectId': int(self.project_ids[index]),
+                'alertType': 'missing_data',
+                'severity': 'medium',
+                'message': f"Missing planned or executed quantity for item {self.item_codes[index]}",
+            })
+        for index in np.flatnonzero(self.status != STATUS_ON_TRACK):
+            critical = self.status[index] == STATUS_CRITICAL
+            label = 'Critical' if critical else 'High'
+            rows.append({
+                'mqtLineId': int(self.line_ids[index]),
+                'projectId': int(self.project_ids[index]),
+                'alertType': 'variance_critical' if critical else 'variance_high',
+                'severity': 'critical' if critical else 'high',
+                'message': f"{label} variance detected: {self.percentage[index]:.2f}% "
+                           f"for item {self.item_codes[index]}",
+            })
+        return rows
+
+
+def process_lines(lines, warning=VARIANCE_THRESHOLD_WARNING, critical=VARIANCE_THRESHOLD_CRITICAL):
+    """Compute variance, status and alerts for a list of mqtLines rows (dicts)"""
+    count = len(lines)
+    variance, percentage, status, missing = compute_variance(
+        to_float_array(line.get('plannedQuantity') for line in lines),
+        to_float_array(line.get('executedQuantity') for line in lines),
+        warning,
+        critical,
+    )
+    return VarianceResult(
+        line_ids=np.fromiter((line['id'] for line in lines), np.int64, count),
+        project_ids=np.fromiter((line['projectId'] for line in lines), np.int64, count),
+        item_codes=[line.get('itemCode', '') for line in lines],
+        variance=variance,
+        percentage=percentage,
+        status=status,
+        missing=missing,
+    )
+
+
+def write_results(connection, result, batch_size=WRITE_BATCH_SIZE):
+    """
+    Write line updates and alerts through a DB-API connection (format paramstyle,
+    e.g. PyMySQL), batch_size rows per statement, in a single transaction.
+
+    Recomputing is idempotent: an alert is only inserted if its line has no open alert
+    of the same type, and open alerts of the recomputed lines that no longer apply are
+    resolved. Returns (lines updated, alerts inserted, alerts resolved).
+    """
+    updates = result.line_updates()
+    alerts = result.alerts()
+    current = {(a['mqtLineId'], a['alertType']) for a in alerts}
+    line_ids = result.line_ids.tolist()
+
+    cursor = connection.cursor()
+    try:
+        open_alerts = set()
+        stale = []
+        for start in range(0, len(line_ids), batch_size):
+            chunk = line_ids[start:start + batch_size]
+            cursor.execute(SELECT_OPEN_ALERTS_SQL.format(', '.join(['%s'] * len(chunk))), chunk)
+            for alert_id, line_id, alert_type in cursor.fetchall():
+                if (line_id, alert_type) in current:
+                    open_alerts.add((line_id, alert_type))
+                else:
+                    stale.append((alert_id,))
+
+        new_alerts = [
+            (a['mqtLineId'], a['projectId'], a['alertType'], a['severity'], a['message'])
+            for a in alerts
+            if (a['mqtLineId'], a['alertType']) not in open_alerts
+        ]
+        for start in range(0, len(updates), batch_size):
+            cursor.executemany(UPDATE_LINES_SQL, updates[start:start + batch_size])
+        for start in range(0, len(stale), batch_size):
+            cursor.executemany(RESOLVE_ALERTS_SQL, stale[start:start + batch_size])
+        for start in range(0, len(new_alerts), batch_size):
+            cursor.executemany(INSERT_ALERTS_SQL, new_alerts[start:start + batch_size])
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+    return len(updates), len(new_alerts), len(stale)
+
+
+def benchmark(count=50000):
+    """Time compute + alert generation for synthetic lines across several projects"""
+    rng = np.random.default_rng(0)
+    planned = rng.uniform(1, 500, count).round(2)
+    executed = (planned * rng.uniform(0.7, 1.3, count)).round(2)
+    lines = [
+        {
+            'id': i + 1,
+            'projectId': i % 40 + 1,
+            'itemCode': f"{i % 25 + 1}.{i // 25 + 1}",
+            'plannedQuantity': f"{planned[i]:.2f}",
+            'executedQuantity': None if i % 500 == 0 else f"{executed[i]:.2f}",
+        }
+        for i in range(count)
+    ]
+
+    start = time.perf_counter()
+    result = process_lines(lines)
+    compute_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    alerts = result.alerts()
+    updates = result.line_updates()
+    rows_time = time.perf_counter() - start
+
+    print(f"Lines: {count:,}  {result.status_counts()}")
+    print(f"Variance + status: {compute_time * 1000:.1f} ms")
+    print(f"Alert rows ({len(alerts):,}) + update rows ({len(updates):,}): {rows_time * 1000:.1f} ms")
+
+
+def main():
+    args = sys.argv[1:]
+    if args and args[0] == '--benchmark':
+        benchmark(int(args[1]) if len(args) > 1 else 50000)
+        return
+
+    thresholds = {'--warning': VARIANCE_THRESHOLD_WARNING, '--critical': VARIANCE_THRESHOLD_CRITICAL}
+    for flag in thresholds:
+        if flag in args:
+            position = args.index(flag)
+            thresholds[flag] = float(args[position + 1])
+            del args[position:position + 2]
+
+    if not args:
+        print(__doc__.strip().split('Usage:')[1])
+        sys.exit(1)
+
+    input_path = args[0]
+    output_path = args[1] if len(args) > 1 else input_path.replace('.json', '-variance.json')
+    with open(input_path, encoding='utf-8') as f:
+        lines = json.load(f)
+
+    result = process_lines(lines, thresholds['--warning'], thresholds['--critical'])
+    updates = [
+        {'id': line_id, 'variance': variance, 'variancePercentage': percentage, 'status': status}
+        for variance, percentage, status, line_id in result.line_updates()
+    ]
+    alerts = result.alerts()
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({'lines': updates, 'alerts': alerts}, f, ensure_ascii=False, indent=2)
+
+    print(f"Lines: {len(result)}  {result.status_counts()}")
+    print(f"Alerts: {len(alerts)}")
+    print(f"Data saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()